@@ -3,6 +3,7 @@ from __future__ import annotations
 import bisect
 import contextlib
 import difflib
+import itertools
 from collections.abc import Callable
 from collections.abc import Generator
 from collections.abc import Iterator
@@ -35,8 +36,15 @@ def _diff_codes(
             yield op, i1, i2, j1, j2
 
 
-def _offsets(s: str, tab_size: int) -> tuple[int, ...]:
-    ret = [0]
+def _offsets(s: str, tab_size: int, start: int = 0) -> tuple[int, ...]:
+    # printable ascii (no tabs / control characters) is always 1 column wide
+    if s.isascii() and s.isprintable():
+        return tuple(range(start, start + len(s) + 1))
+    # without tabs, the positions are a running sum of the widths
+    elif '\t' not in s:
+        return tuple(itertools.accumulate(map(wcwidth, s), initial=start))
+
+    ret = [start]
     for c in s:
         if c == '\t':
             ret.append(ret[-1] + (tab_size - ret[-1] % tab_size))
@@ -72,7 +80,27 @@ class DelModification(NamedTuple):
         del buf[self.idx]
 
 
+def append_modification(
+        modifications: list[Modification],
+        modification: Modification,
+) -> None:
+    # when a line is set repeatedly only its original value needs restoring
+    if (
+            isinstance(modification, SetModification) and
+            modifications and
+            isinstance(modifications[-1], SetModification) and
+            modifications[-1].idx == modification.idx
+    ):
+        return
+    modifications.append(modification)
+
+
 class Buf:
+    __slots__ = (
+        '_lines', 'expandtabs', 'tab_size', 'file_y', 'y', '_x', '_x_hint',
+        '_set_callbacks', '_del_callbacks', '_ins_callbacks', '_positions',
+    )
+
     def __init__(self, lines: list[str], tab_size: int = 4) -> None:
         self._lines = lines
         self.expandtabs = True
@@ -83,7 +111,7 @@ class Buf:
         self._del_callbacks: list[DelCallback] = []
         self._ins_callbacks: list[InsCallback] = []
 
-        self._positions: list[tuple[int, ...] | None] = []
+        self._positions: list[tuple[int, ...] | None] = [None] * len(lines)
 
     # read only interface
 
@@ -125,8 +153,8 @@ class Buf:
         victim = self._lines[idx]
 
         del self._lines[idx]
+        del self._positions[idx]
 
-        self._del_cb(self, idx, victim)
         for del_callback in self._del_callbacks:
             del_callback(self, idx, victim)
 
@@ -135,11 +163,33 @@ class Buf:
             idx %= len(self)
 
         self._lines.insert(idx, val)
+        self._positions.insert(idx, None)
 
-        self._ins_cb(self, idx)
         for ins_callback in self._ins_callbacks:
             ins_callback(self, idx)
 
+    def insert_lines(self, idx: int, lines: list[str]) -> None:
+        if idx < 0:
+            idx %= len(self)
+
+        self._lines[idx:idx] = lines
+        self._positions[idx:idx] = [None] * len(lines)
+
+        for i in range(idx, idx + len(lines)):
+            for ins_callback in self._ins_callbacks:
+                ins_callback(self, i)
+
+    def delete_lines(self, start: int, end: int) -> None:
+        victims = self._lines[start:end]
+
+        del self._lines[start:end]
+        del self._positions[start:end]
+
+        # as if `start` were deleted once per line
+        for victim in victims:
+            for del_callback in self._del_callbacks:
+                del_callback(self, start, victim)
+
     # also mutators, but implemented using above functions
 
     def append(self, val: str) -> None:
@@ -168,12 +218,12 @@ class Buf:
         """the file lines will always contain a blank empty string at the end'
         to simplify rendering.  call this whenever the last line may change
         """
-        if self[-1] != '':
+        if self._lines[-1] != '':
             self.append('')
 
     def set_tab_size(self, tab_size: int) -> None:
         self.tab_size = tab_size
-        self._positions = [None]
+        self._positions = [None] * len(self._lines)
 
     # event handling
 
@@ -205,7 +255,7 @@ class Buf:
         modifications: list[Modification] = []
 
         def set_cb(buf: Buf, idx: int, victim: str) -> None:
-            modifications.append(SetModification(idx, victim))
+            append_modification(modifications, SetModification(idx, victim))
 
         def del_cb(buf: Buf, idx: int, victim: str) -> None:
             modifications.append(InsModification(idx, victim))
@@ -244,23 +294,23 @@ class Buf:
         self._x = x
         self._x_hint = self._cursor_x
 
-    def _extend_positions(self, idx: int) -> None:
-        self._positions.extend([None] * (1 + idx - len(self._positions)))
-
     def _set_cb(self, buf: Buf, idx: int, victim: str) -> None:
-        self._extend_positions(idx)
-        self._positions[idx] = None
-
-    def _del_cb(self, buf: Buf, idx: int, victim: str) -> None:
-        self._extend_positions(idx)
-        del self._positions[idx]
-
-    def _ins_cb(self, buf: Buf, idx: int) -> None:
-        self._extend_positions(idx)
-        self._positions.insert(idx, None)
+        positions = self._positions[idx]
+        if positions is None:
+            return
+
+        # typing / deleting at the end of a line leaves the positions of the
+        # rest of the line unchanged so only the difference needs measuring
+        line = self._lines[idx]
+        if line.startswith(victim):
+            tail = _offsets(line[len(victim):], self.tab_size, positions[-1])
+            self._positions[idx] = positions + tail[1:]
+        elif victim.startswith(line):
+            self._positions[idx] = positions[:len(line) + 1]
+        else:
+            self._positions[idx] = None
 
     def line_positions(self, idx: int) -> tuple[int, ...]:
-        self._extend_positions(idx)
         value = self._positions[idx]
         if value is None:
             value = _offsets(self._lines[idx], self.tab_size)
@@ -276,7 +326,8 @@ class Buf:
 
     def cursor_position(self, dim: Dim) -> tuple[int, int]:
         y = self.y - self.file_y + dim.y
-        x = self._cursor_x - self.line_x(dim)
+        cursor_x = self._cursor_x
+        x = cursor_x - line_x(cursor_x, dim.width)
         return y, x
 
     def fixup_position(self, dim: Dim) -> None:
@@ -298,8 +349,13 @@ class Buf:
 
     def rendered_line(self, idx: int, dim: Dim) -> str:
         x = self._cursor_x if idx == self.y else 0
-        expanded = self._lines[idx].expandtabs(self.tab_size).lstrip('\ufeff')
-        return scrolled_line(expanded, x, dim.width)
+        line = self._lines[idx]
+        # avoid copying the line when there is nothing to expand / strip
+        if '\t' in line:
+            line = line.expandtabs(self.tab_size)
+        if not line.isascii():
+            line = line.lstrip('\ufeff')
+        return scrolled_line(line, x, dim.width)
 
     # movement
 
@@ -311,8 +367,8 @@ class Buf:
     def _set_x_after_vertical_movement(self) -> None:
         positions = self.line_positions(self.y)
         x = bisect.bisect_left(positions, self._x_hint)
-        x = min(len(self._lines[self.y]), x)
-        if positions[x] > self._x_hint:
+        # there is one more position than there are characters in the line
+        if x == len(positions) or positions[x] > self._x_hint:
             x -= 1
         self._x = x
 
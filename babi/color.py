@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from typing import NamedTuple
 
 # TODO: find a standard which defines these
@@ -13,9 +14,11 @@ class Color(NamedTuple):
     b: int
 
     @classmethod
+    @functools.lru_cache(maxsize=1024)
     def parse(cls, s: str) -> Color:
         if s.startswith('#') and len(s) >= 7:
-            return cls(r=int(s[1:3], 16), g=int(s[3:5], 16), b=int(s[5:7], 16))
+            r, g, b = bytes.fromhex(s[1:7])
+            return cls(r=r, g=g, b=b)
         elif s.startswith('#'):
             return cls.parse(f'#{s[1] * 2}{s[2] * 2}{s[3] * 2}')
         else:
@@ -8,7 +8,10 @@ from babi.color import Color
 
 
 def _square_distance(c1: Color, c2: Color) -> int:
-    return (c1.r - c2.r) ** 2 + (c1.g - c2.g) ** 2 + (c1.b - c2.b) ** 2
+    dr = c1.r - c2.r
+    dg = c1.g - c2.g
+    db = c1.b - c2.b
+    return dr * dr + dg * dg + db * db
 
 
 class KD(NamedTuple):
@@ -37,12 +40,12 @@ def nearest(color: Color, colors: KD | None) -> int:
     best = 0
     dist = 2 ** 32
 
-    def _search(kd: KD | None, *, depth: int) -> None:
-        nonlocal best
-        nonlocal dist
-
-        if kd is None:
-            return
+    # (node, depth, minimum possible distance of anything in that subtree)
+    stack = [(colors, 0, 0)]
+    while stack:
+        kd, depth, min_dist = stack.pop()
+        if kd is None or min_dist >= dist:
+            continue
 
         cand_dist = _square_distance(color, kd.color)
         if cand_dist < dist:
@@ -51,15 +54,13 @@ def nearest(color: Color, colors: KD | None) -> int:
         axis = depth % 3
         diff = color[axis] - kd.color[axis]
         if diff > 0:
-            _search(kd.right, depth=depth + 1)
-            if diff ** 2 < dist:
-                _search(kd.left, depth=depth + 1)
+            near, far = kd.right, kd.left
         else:
-            _search(kd.left, depth=depth + 1)
-            if diff ** 2 < dist:
-                _search(kd.right, depth=depth + 1)
+            near, far = kd.left, kd.right
+        # pushed first so the near side is searched (and `dist` shrinks) first
+        stack.append((far, depth + 1, diff * diff))
+        stack.append((near, depth + 1, 0))
 
-    _search(colors, depth=0)
     return best
 
 
@@ -75,3 +76,8 @@ def make_256() -> KD | None:
         colors.append((Color(v, v, v), 232 + i))
 
     return _build(colors)
+
+
+@functools.lru_cache(maxsize=4096)
+def nearest_256(color: Color) -> int:
+    return nearest(color, make_256())
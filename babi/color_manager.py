@@ -8,8 +8,11 @@ from babi.color import Color
 
 
 def _color_to_curses(color: Color) -> tuple[int, int, int]:
-    factor = 1000 / 255
-    return int(color.r * factor), int(color.g * factor), int(color.b * factor)
+    return (
+        color.r * 1000 // 255,
+        color.g * 1000 // 255,
+        color.b * 1000 // 255,
+    )
 
 
 class ColorManager(NamedTuple):
@@ -22,7 +25,7 @@ class ColorManager(NamedTuple):
             self.colors[color] = n
             curses.init_color(n, *_color_to_curses(color))
         elif curses.COLORS >= 256:
-            self.colors[color] = color_kd.nearest(color, color_kd.make_256())
+            self.colors[color] = color_kd.nearest_256(color)
         else:
             self.colors[color] = -1
 
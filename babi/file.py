@@ -1,12 +1,9 @@
 from __future__ import annotations
 
-import collections
 import contextlib
 import curses
 import functools
 import hashlib
-import io
-import itertools
 import os.path
 import re
 from collections.abc import Callable
@@ -14,14 +11,12 @@ from collections.abc import Generator
 from re import Match
 from re import Pattern
 from typing import Concatenate
-from typing import IO
-from typing import Literal
 from typing import NamedTuple
 from typing import ParamSpec
 from typing import TYPE_CHECKING
-from typing import TypedDict
 from typing import TypeVar
 
+from babi.buf import append_modification
 from babi.buf import Buf
 from babi.buf import Modification
 from babi.dim import Dim
@@ -41,41 +36,51 @@ P = ParamSpec('P')
 R = TypeVar('R')
 FileMethod = Callable[Concatenate['File', P], R]
 
-WS_RE = re.compile(r'^\s*')
+WS_RE = re.compile(r'\s*')
+ALNUM_RE = re.compile(r'[^\W_]+')
+NOT_ALNUM_RE = re.compile(r'[\W_]+')
 
+EMPTY_SHA256 = hashlib.sha256(b'').hexdigest()
 
-class OpenSettings(TypedDict):
-    encoding: Literal['UTF-8']
-    newline: Literal['']
 
+class NullByteError(ValueError):
+    pass
 
-OPEN_SETTINGS = OpenSettings(encoding='UTF-8', newline='')
 
+def _split_lines(s: str) -> tuple[list[str], str, bool]:
+    if '\0' in s:
+        raise NullByteError
 
-class NullByteError(ValueError):
-    pass
+    crlf = s.count('\r\n')
+    lf = s.count('\n') - crlf
+    nl = '\r\n' if crlf > lf else '\n'  # default to `\n`
+    mixed = crlf > 0 and lf > 0
 
+    # a lone `\r` is not a line ending and is kept in the line
+    if not crlf:
+        lines = s.split('\n')
+    elif not lf:
+        lines = s.split('\r\n')
+    else:
+        lines = s.replace('\r\n', '\n').split('\n')
 
-def get_lines(sio: IO[str]) -> tuple[list[str], str, bool, str]:
-    sha256 = hashlib.sha256()
-    lines = []
-    newlines = collections.Counter({'\n': 0})  # default to `\n`
-    for line in sio:
-        if '\0' in line:
-            raise NullByteError
-        sha256.update(line.encode())
-        for ending in ('\r\n', '\n'):
-            if line.endswith(ending):
-                lines.append(line[:-1 * len(ending)])
-                newlines[ending] += 1
-                break
-        else:
-            lines.append(line)
     # always make sure we end in a newline
-    lines.append('')
-    (nl, _), = newlines.most_common(1)
-    mixed = len({k for k, v in newlines.items() if v}) > 1
-    return lines, nl, mixed, sha256.hexdigest()
+    if lines[-1]:
+        lines.append('')
+    return lines, nl, mixed
+
+
+def _get_lines_from_text(s: str) -> tuple[list[str], str, bool, str]:
+    lines, nl, mixed = _split_lines(s)
+    return lines, nl, mixed, hashlib.sha256(s.encode()).hexdigest()
+
+
+def _run_end(s: str, x: int) -> int:
+    """the end of the run of alnum / non-alnum characters starting at x"""
+    reg = ALNUM_RE if s[x].isalnum() else NOT_ALNUM_RE
+    match = reg.match(s, x)
+    assert match is not None
+    return match.end()
 
 
 class OpenError(RuntimeError):
@@ -84,8 +89,10 @@ class OpenError(RuntimeError):
 
 def _load_file(filename: str) -> tuple[list[str], str, bool, str]:
     try:
-        with open(filename, encoding='UTF-8', newline='') as f:
-            return get_lines(f)
+        # hash the bytes as read rather than re-encoding each line
+        with open(filename, 'rb') as f:
+            contents = f.read()
+        lines, nl, mixed = _split_lines(contents.decode())
     except NullByteError:
         raise OpenError(fr'error! file contains \0 bytes: {filename!r}')
     except UnicodeDecodeError:
@@ -93,9 +100,15 @@ def _load_file(filename: str) -> tuple[list[str], str, bool, str]:
     except OSError:
         # XXX: not quite correct, but maybe fix another day
         raise OpenError(f'error! not a file: {filename!r}')
+    return lines, nl, mixed, hashlib.sha256(contents).hexdigest()
 
 
 class Action:
+    __slots__ = (
+        'name', 'modifications', 'start_x', 'start_y', 'start_modified',
+        'end_x', 'end_y', 'end_modified', 'final',
+    )
+
     def __init__(
             self, *, name: str, modifications: list[Modification],
             start_x: int, start_y: int, start_modified: bool,
@@ -219,28 +232,30 @@ class _SearchIter:
         return Found(y, match)
 
     def __next__(self) -> tuple[int, Match[str]]:
-        x = self.file.buf.x + self.offset
-        y = self.file.buf.y
+        buf = self.file.buf
+        search = self.reg.search
+        x = buf.x + self.offset
+        y = buf.y
 
-        match = self.reg.search(self.file.buf[y], x)
+        match = search(buf[y], x)
         if match:
             return self._stop_if_past_original(y, match)
 
         if self.wrapped:
             for line_y in range(y + 1, self._start_y + 1):
-                match = self.reg.search(self.file.buf[line_y])
+                match = search(buf[line_y])
                 if match:
                     return self._stop_if_past_original(line_y, match)
         else:
-            for line_y in range(y + 1, len(self.file.buf) - 1):
-                match = self.reg.search(self.file.buf[line_y])
+            for line_y in range(y + 1, len(buf) - 1):
+                match = search(buf[line_y])
                 if match:
                     return self._stop_if_past_original(line_y, match)
 
             self.wrapped = True
 
             for line_y in range(0, self._start_y + 1):
-                match = self.reg.search(self.file.buf[line_y])
+                match = search(buf[line_y])
                 if match:
                     return self._stop_if_past_original(line_y, match)
 
@@ -288,19 +303,20 @@ class File:
             self.is_stdin = False
             self.filename = None
             self.modified = True
-            sio = io.StringIO(stdin)
-            lines, self.nl, mixed, self.sha256 = get_lines(sio)
+            lines, self.nl, mixed, self.sha256 = _get_lines_from_text(stdin)
         elif self.filename is not None and os.path.lexists(self.filename):
             try:
                 lines, self.nl, mixed, self.sha256 = _load_file(self.filename)
             except OpenError as e:
                 status.update(str(e))
                 self.filename = None
-                lines, self.nl, mixed, self.sha256 = get_lines(io.StringIO(''))
+                lines, self.nl, mixed = [''], '\n', False
+                self.sha256 = EMPTY_SHA256
         else:
             if self.filename is not None:
                 status.update('(new file)')
-            lines, self.nl, mixed, self.sha256 = get_lines(io.StringIO(''))
+            lines, self.nl, mixed = [''], '\n', False
+            self.sha256 = EMPTY_SHA256
 
         self.buf = Buf(lines, self.buf.tab_size)
 
@@ -403,19 +419,18 @@ class File:
             self.buf.right(dim)
         # if we're at the end of the line, jump forward to the next non-ws
         elif self.buf.x == len(line):
-            while (
-                    self.buf.y < len(self.buf) - 1 and (
-                        self.buf.x == len(self.buf[self.buf.y]) or
-                        self.buf[self.buf.y][self.buf.x].isspace()
-                    )
-            ):
+            while self.buf.y < len(self.buf) - 1:
+                line = self.buf[self.buf.y]
+                # skip a whole run of whitespace at a time
+                ws_match = WS_RE.match(line, self.buf.x)
+                assert ws_match is not None
+                self.buf.x = ws_match.end()
+                if self.buf.x < len(line):
+                    break
                 self.buf.right(dim)
         # if we're inside the line, jump to next position that's not our type
         else:
-            self.buf.right(dim)
-            tp = line[self.buf.x].isalnum()
-            while self.buf.x < len(line) and tp == line[self.buf.x].isalnum():
-                self.buf.right(dim)
+            self.buf.x = _run_end(line, self.buf.x + 1)
 
     @action
     def ctrl_left(self, dim: Dim) -> None:
@@ -430,10 +445,11 @@ class File:
             while self.buf.y > 0 and self.buf.x == 0:
                 self.buf.left(dim)
         else:
-            self.buf.left(dim)
-            tp = line[self.buf.x - 1].isalnum()
-            while self.buf.x > 0 and tp == line[self.buf.x - 1].isalnum():
-                self.buf.left(dim)
+            x = self.buf.x - 1
+            tp = line[x - 1].isalnum()
+            while x > 0 and tp == line[x - 1].isalnum():
+                x -= 1
+            self.buf.x = x
 
     @action
     def ctrl_home(self, dim: Dim) -> None:
@@ -513,12 +529,14 @@ class File:
                         self.buf[line_y] = (
                             f'{line[:match.start()]}{replaced_lines[0]}'
                         )
-                        for i, ins_line in enumerate(replaced_lines[1:-1], 1):
-                            self.buf.insert(line_y + i, ins_line)
-                        last_insert = line_y + len(replaced_lines) - 1
-                        self.buf.insert(
-                            last_insert, f'{replaced_lines[-1]}{line[end:]}',
+                        self.buf.insert_lines(
+                            line_y + 1,
+                            [
+                                *replaced_lines[1:-1],
+                                f'{replaced_lines[-1]}{line[end:]}',
+                            ],
                         )
+                        last_insert = line_y + len(replaced_lines) - 1
                         self.buf.y = last_insert
                         self.buf.x = 0
                         search.offset = len(replaced_lines[-1])
@@ -676,12 +694,12 @@ class File:
 
     @edit_action('insert tab', final=False)
     def _tab(self, dim: Dim) -> None:
-        tab_string = self.buf.tab_string
-        if tab_string == '\t':
-            n = 1
-        else:
+        if self.buf.expandtabs:
             n = self.buf.tab_size - self.buf.x % self.buf.tab_size
-            tab_string = tab_string[:n]
+            tab_string = ' ' * n
+        else:
+            n = 1
+            tab_string = '\t'
         line = self.buf[self.buf.y]
         self.buf[self.buf.y] = (
             line[:self.buf.x] + tab_string + line[self.buf.x:]
@@ -697,10 +715,7 @@ class File:
 
     def _dedent_line(self, s: str) -> int:
         bound = min(len(s), len(self.buf.tab_string))
-        i = 0
-        while i < bound and s[i] in (' ', '\t'):
-            i += 1
-        return i
+        return bound - len(s[:bound].lstrip(' \t'))
 
     @edit_action('dedent selection', final=True)
     def _dedent_selection(self, dim: Dim) -> None:
@@ -745,8 +760,7 @@ class File:
             ret.append(self.buf[e_y][:e_x])
 
             self.buf[s_y] = self.buf[s_y][:s_x] + self.buf[e_y][e_x:]
-            for _ in range(s_y + 1, e_y + 1):
-                self.buf.pop(s_y + 1)
+            self.buf.delete_lines(s_y + 1, e_y + 1)
         self.buf.y = s_y
         self.buf.x = s_x
         self.buf.scroll_screen_if_needed(dim)
@@ -766,13 +780,17 @@ class File:
                 return cut_buffer + (victim,)
 
     def _uncut(self, cut_buffer: tuple[str, ...], dim: Dim) -> None:
-        for cut_line in cut_buffer:
-            line = self.buf[self.buf.y]
-            before, after = line[:self.buf.x], line[self.buf.x:]
-            self.buf[self.buf.y] = before + cut_line
-            self.buf.insert(self.buf.y + 1, after)
+        if not cut_buffer:
+            return
+
+        line = self.buf[self.buf.y]
+        before, after = line[:self.buf.x], line[self.buf.x:]
+        # the current line is split once and the cut lines go between
+        self.buf[self.buf.y] = before + cut_buffer[0]
+        self.buf.insert_lines(self.buf.y + 1, [*cut_buffer[1:], after])
+        for _ in cut_buffer:
             self.buf.down(dim)
-            self.buf.x = 0
+        self.buf.x = 0
 
     @edit_action('uncut', final=True)
     @clear_selection
@@ -792,10 +810,13 @@ class File:
         self.buf.restore_eof_invariant()
 
     def _sort(self, dim: Dim, s_y: int, e_y: int, reverse: bool) -> None:
-        # self.buf intentionally does not support slicing so we use islice
-        lines = sorted(itertools.islice(self.buf, s_y, e_y), reverse=reverse)
+        # self.buf intentionally does not support slicing so we index it
+        # (islice would walk every line before s_y as well)
+        lines = sorted((self.buf[i] for i in range(s_y, e_y)), reverse=reverse)
         for i, line in zip(range(s_y, e_y), lines):
-            self.buf[i] = line
+            # lines already in place don't need to be set (or re-highlighted)
+            if self.buf[i] != line:
+                self.buf[i] = line
 
         self.buf.y = s_y
         self.buf.x = 0
@@ -819,26 +840,28 @@ class File:
         self._sort(dim, s_y, e_y, reverse=reverse)
 
     def _is_commented(self, lineno: int, prefix: str) -> bool:
-        return self.buf[lineno].lstrip().startswith(prefix)
+        return self.buf[lineno].startswith(prefix, self._ws_len(lineno))
 
-    def _indent(self, lineno: int) -> str:
+    def _ws_len(self, lineno: int) -> int:
+        # matching (rather than lstrip) avoids copying the rest of the line
         ws_match = WS_RE.match(self.buf[lineno])
         assert ws_match is not None
-        return ws_match[0]
+        return ws_match.end()
 
     def _minimum_indent_for_selection(self) -> int:
         s_y, e_y = self._selection_lines()
-        return min(len(self._indent(lineno)) for lineno in range(s_y, e_y))
+        return min(self._ws_len(lineno) for lineno in range(s_y, e_y))
 
     def _comment_remove(self, lineno: int, prefix: str) -> None:
         line = self.buf[lineno]
-        indent = self._indent(lineno)
-        ws_len = len(indent)
+        ws_len = self._ws_len(lineno)
 
-        if line.startswith(f'{prefix} ', ws_len):
-            self.buf[lineno] = f'{indent}{line[ws_len + len(prefix) + 1:]}'
-        elif line.startswith(prefix, ws_len):
-            self.buf[lineno] = f'{indent}{line[ws_len + len(prefix):]}'
+        if line.startswith(prefix, ws_len):
+            end = ws_len + len(prefix)
+            # also remove the space following the prefix
+            if line.startswith(' ', end):
+                end += 1
+            self.buf[lineno] = f'{line[:ws_len]}{line[end:]}'
 
         if self.buf.y == lineno and self.buf.x > ws_len:
             self.buf.x -= len(line) - len(self.buf[lineno])
@@ -859,7 +882,7 @@ class File:
         if self._is_commented(self.buf.y, prefix):
             self._comment_remove(self.buf.y, prefix)
         else:
-            ws_len = len(self._indent(self.buf.y))
+            ws_len = self._ws_len(self.buf.y)
             self._comment_add(self.buf.y, prefix, ws_len)
 
     @edit_action('comment selection', final=True)
@@ -945,9 +968,10 @@ class File:
     @edit_action('text', final=False)
     @clear_selection
     def c(self, wch: str, dim: Dim) -> None:
-        s = self.buf[self.buf.y]
-        self.buf[self.buf.y] = s[:self.buf.x] + wch + s[self.buf.x:]
-        self.buf.x += len(wch)
+        y, x = self.buf.y, self.buf.x
+        s = self.buf[y]
+        self.buf[y] = s[:x] + wch + s[x:]
+        self.buf.x = x + len(wch)
         self.buf.restore_eof_invariant()
 
     def finalize_previous_action(self) -> None:
@@ -986,7 +1010,10 @@ class File:
             if continue_last:
                 self.undo_stack[-1].end_x = self.buf.x
                 self.undo_stack[-1].end_y = self.buf.y
-                self.undo_stack[-1].modifications.extend(modifications)
+                for modification in modifications:
+                    append_modification(
+                        self.undo_stack[-1].modifications, modification,
+                    )
             elif modifications:
                 self.modified = True
                 action = Action(
@@ -1025,23 +1052,37 @@ class File:
         for file_hl in self._file_hls:
             file_hl.highlight_until(self.buf, self.buf.file_y + to_display)
 
+        cursor_y = self.buf.y
+        cursor_l_x = self.buf.line_x(dim)
+
         for i in range(to_display):
             draw_y = i + dim.y
             l_y = self.buf.file_y + i
             stdscr.insstr(draw_y, 0, self.buf.rendered_line(l_y, dim))
 
-            l_x = self.buf.line_x(dim) if l_y == self.buf.y else 0
-            l_x_max = l_x + dim.width
+            # only rows with regions need their positions computed
+            row_regions = []
             for file_hl in self._file_hls:
-                for region in file_hl.regions[l_y]:
-                    l_positions = self.buf.line_positions(l_y)
-                    r_x = l_positions[region.x]
+                regions = file_hl.regions[l_y]
+                if regions:
+                    row_regions.append((file_hl.include_edge, regions))
+            if not row_regions:
+                continue
+
+            l_x = cursor_l_x if l_y == cursor_y else 0
+            l_x_max = l_x + dim.width
+            l_positions = self.buf.line_positions(l_y)
+            l_positions_len = len(l_positions)
+            l_positions_last = l_positions[-1]
+            for include_edge, regions in row_regions:
+                for region_x, region_end, attr in regions:
+                    r_x = l_positions[region_x]
                     # the selection highlight intentionally extends one past
                     # the end of the line, which won't have a position
-                    if region.end == len(l_positions):
-                        r_end = l_positions[-1] + 1
+                    if region_end == l_positions_len:
+                        r_end = l_positions_last + 1
                     else:
-                        r_end = l_positions[region.end]
+                        r_end = l_positions[region_end]
 
                     if r_x >= l_x_max:
                         break
@@ -1049,22 +1090,22 @@ class File:
                         continue
 
                     if l_x and r_x <= l_x:
-                        if file_hl.include_edge:
+                        if include_edge:
                             h_s_x = 0
                         else:
                             h_s_x = 1
                     else:
                         h_s_x = r_x - l_x
 
-                    if r_end >= l_x_max and l_x_max < l_positions[-1]:
-                        if file_hl.include_edge:
+                    if r_end >= l_x_max and l_x_max < l_positions_last:
+                        if include_edge:
                             h_e_x = dim.width
                         else:
                             h_e_x = dim.width - 1
                     else:
                         h_e_x = r_end - l_x
 
-                    stdscr.chgat(draw_y, h_s_x, h_e_x - h_s_x, region.attr)
+                    stdscr.chgat(draw_y, h_s_x, h_e_x - h_s_x, attr)
 
         for i in range(to_display, dim.height):
             stdscr.move(i + dim.y, 0)
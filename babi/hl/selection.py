@@ -15,13 +15,27 @@ class Selection:
         self.regions: dict[int, HLs] = collections.defaultdict(tuple)
         self.start: tuple[int, int] | None = None
         self.end: tuple[int, int] | None = None
+        self._dirty = False
+
+    def _set_cb(self, lines: Buf, idx: int, victim: str) -> None:
+        self._dirty = True
+
+    def _del_cb(self, lines: Buf, idx: int, victim: str) -> None:
+        self._dirty = True
+
+    def _ins_cb(self, lines: Buf, idx: int) -> None:
+        self._dirty = True
 
     def register_callbacks(self, buf: Buf) -> None:
-        """our highlight regions are populated in other ways"""
+        # regions are only rebuilt when the selection or the lines change
+        buf.add_set_callback(self._set_cb)
+        buf.add_del_callback(self._del_cb)
+        buf.add_ins_callback(self._ins_cb)
 
     def highlight_until(self, lines: Buf, idx: int) -> None:
-        if self.start is None or self.end is None:
+        if self.start is None or self.end is None or not self._dirty:
             return
+        self._dirty = False
 
         # XXX: this assumes pair 1 is the background
         attr = curses.A_REVERSE | curses.A_DIM | curses.color_pair(1)
@@ -55,3 +69,4 @@ class Selection:
     def set(self, s_y: int, s_x: int, e_y: int, e_x: int) -> None:
         self.clear()
         self.start, self.end = (s_y, s_x), (e_y, e_x)
+        self._dirty = True
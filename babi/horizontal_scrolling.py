@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import curses
-from functools import cached_property
+import functools
 
 
 def line_x(x: int, width: int) -> int:
@@ -22,7 +22,8 @@ def line_x(x: int, width: int) -> int:
 def scrolled_line(s: str, x: int, width: int) -> str:
     l_x = line_x(x, width)
     if l_x:
-        s = f'«{s[l_x + 1:]}'
+        # only slice what can be displayed (+1 to know whether to add `»`)
+        s = f'«{s[l_x + 1:l_x + width + 1]}'
         if len(s) > width:
             return f'{s[:width - 1]}»'
         else:
@@ -34,7 +35,7 @@ def scrolled_line(s: str, x: int, width: int) -> str:
 
 
 class _CalcWidth:
-    @cached_property
+    @functools.cached_property
     def _window(self) -> curses._CursesWindow:
         return curses.newwin(1, 10)
 
@@ -43,5 +44,6 @@ class _CalcWidth:
         return self._window.getyx()[1]
 
 
-wcwidth = _CalcWidth().wcwidth
+# measuring goes through curses, the width of a character never changes
+wcwidth = functools.cache(_CalcWidth().wcwidth)
 del _CalcWidth
@@ -24,16 +24,24 @@ POSITION_RE = re.compile(r'^\+-?\d+$')
 def _edit(screen: Screen, stdin: str) -> EditResult:
     screen.file.ensure_loaded(screen.status, screen.layout.file, stdin)
 
+    file_dispatch = File.DISPATCH
+    screen_dispatch = Screen.DISPATCH
+
     while True:
         screen.status.tick(screen.layout.file)
-        screen.draw()
-        screen.file.move_cursor(screen.stdscr, screen.layout.file)
+        # an edit is already waiting (such as the rest of a multi-line paste)
+        # so don't bother drawing an intermediate frame
+        if not screen.edit_pending:
+            screen.draw()
+            screen.file.move_cursor(screen.stdscr, screen.layout.file)
 
         key = screen.get_char()
-        if key.keyname in File.DISPATCH:
-            File.DISPATCH[key.keyname](screen.file, screen.layout.file)
-        elif key.keyname in Screen.DISPATCH:
-            ret = Screen.DISPATCH[key.keyname](screen)
+        file_func = file_dispatch.get(key.keyname)
+        screen_func = screen_dispatch.get(key.keyname)
+        if file_func is not None:
+            file_func(screen.file, screen.layout.file)
+        elif screen_func is not None:
+            ret = screen_func(screen)
             if isinstance(ret, EditResult):
                 return ret
         elif key.keyname == b'STRING':
@@ -3,6 +3,7 @@ from __future__ import annotations
 import contextlib
 import curses
 import enum
+import functools
 import hashlib
 import importlib.metadata
 import os
@@ -22,8 +23,6 @@ from babi.color_manager import ColorManager
 from babi.dim import Dim
 from babi.file import Action
 from babi.file import File
-from babi.file import get_lines
-from babi.file import OPEN_SETTINGS
 from babi.history import History
 from babi.hl.syntax import Syntax
 from babi.linters.flake8 import Flake8
@@ -116,6 +115,45 @@ def _get_wch_with_retry(stdscr: curses._CursesWindow) -> str | int:
             pass
 
 
+def _keyname(wch: str | int) -> bytes:
+    keyname = curses.keyname(wch if isinstance(wch, int) else ord(wch))
+    return KEYNAME_REWRITE.get(keyname, keyname)
+
+
+def _file_sha256(filename: str) -> str:
+    # hash in chunks rather than reading (or decoding) the whole file just
+    # to compare it
+    sha256 = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        while True:
+            chunk = f.read(64 * 1024)
+            if not chunk:
+                break
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _header_str(
+        filename: str | None,
+        modified: bool,
+        i: int,
+        n_files: int,
+        width: int,
+) -> str:
+    filename = filename or '<<new file>>'
+    if modified:
+        filename += ' *'
+    if n_files > 1:
+        files = f'[{i + 1}/{n_files}] '
+        version_width = len(VERSION_STR) + 2 + len(files)
+    else:
+        files = ''
+        version_width = len(VERSION_STR) + 2
+    centered = filename.center(width)[version_width:]
+    return f' {VERSION_STR} {files}{centered}'
+
+
 class EditResult(enum.Enum):
     EXIT = enum.auto()
     EXIT_ALL = enum.auto()
@@ -182,17 +220,10 @@ class Screen:
         return self.files[self.i]
 
     def _draw_header(self, dim: Dim) -> None:
-        filename = self.file.filename or '<<new file>>'
-        if self.file.modified:
-            filename += ' *'
-        if len(self.files) > 1:
-            files = f'[{self.i + 1}/{len(self.files)}] '
-            version_width = len(VERSION_STR) + 2 + len(files)
-        else:
-            files = ''
-            version_width = len(VERSION_STR) + 2
-        centered = filename.center(dim.width)[version_width:]
-        s = f' {VERSION_STR} {files}{centered}'
+        s = _header_str(
+            self.file.filename, self.file.modified,
+            self.i, len(self.files), dim.width,
+        )
         self.stdscr.insstr(0, 0, s, curses.A_REVERSE)
 
     def _get_sequence_home_end(self, wch: str) -> str:
@@ -219,7 +250,10 @@ class Screen:
                     return wch
                 else:
                     wch += c
-                    if c == ';':
+                    # stop as soon as we've read a complete sequence
+                    if wch in SEQUENCE_KEYNAME:
+                        return wch
+                    elif c == ';':
                         break
         else:
             return wch  # unexpected input while searching for `;`
@@ -292,10 +326,20 @@ class Screen:
             wch = self._get_string(wch)
             return Key(wch, b'STRING')
 
-        key = wch if isinstance(wch, int) else ord(wch)
-        keyname = curses.keyname(key)
-        keyname = KEYNAME_REWRITE.get(keyname, keyname)
-        return Key(wch, keyname)
+        return Key(wch, _keyname(wch))
+
+    @property
+    def edit_pending(self) -> bool:
+        """whether the buffered key only edits the file (and can't prompt)"""
+        c = self._buffered_input
+        if c is None:
+            return False
+        elif isinstance(c, str) and c.isprintable():
+            return True
+        elif c == '\x1b':  # escape sequences need more input to decode
+            return False
+        else:
+            return _keyname(c) in File.DISPATCH
 
     def get_char(self) -> Key:
         self.perf.end()
@@ -729,15 +773,10 @@ class Screen:
         if not os.path.isfile(self.file.filename):
             sha256: str | None = None
         else:
-            try:
-                with open(self.file.filename, **OPEN_SETTINGS) as f:
-                    *_, sha256 = get_lines(f)
-            except UnicodeDecodeError:
-                # instead of crashing, show "changed on disk" error
-                sha256 = 'error'
+            sha256 = _file_sha256(self.file.filename)
 
-        contents = self.file.nl.join(self.file.buf)
-        sha256_to_save = hashlib.sha256(contents.encode()).hexdigest()
+        contents = self.file.nl.join(self.file.buf).encode()
+        sha256_to_save = hashlib.sha256(contents).hexdigest()
 
         # the file on disk is the same as when we opened it
         if sha256 not in (None, self.file.sha256, sha256_to_save):
@@ -747,7 +786,8 @@ class Screen:
         try:
             dir_path = os.path.dirname(os.path.abspath(self.file.filename))
             os.makedirs(dir_path, exist_ok=True)
-            with open(self.file.filename, 'w', **OPEN_SETTINGS) as f:
+            # already encoded for hashing, write the bytes directly
+            with open(self.file.filename, 'wb') as f:
                 f.write(contents)
         except OSError as e:
             self.status.update(f'cannot save file: {e}')
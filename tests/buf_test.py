@@ -86,6 +86,36 @@ def test_buf_insert_with_negative():
     assert lst == ['a', 'b', 'c']
 
 
+def test_buf_insert_lines():
+    lst = ['a', 'b', 'c']
+
+    buf = Buf(lst)
+
+    with buf.record() as modifications:
+        buf.insert_lines(1, ['q', 'r'])
+
+    assert lst == ['a', 'q', 'r', 'b', 'c']
+
+    buf.apply(modifications)
+
+    assert lst == ['a', 'b', 'c']
+
+
+def test_buf_delete_lines():
+    lst = ['a', 'b', 'c', 'd']
+
+    buf = Buf(lst)
+
+    with buf.record() as modifications:
+        buf.delete_lines(1, 3)
+
+    assert lst == ['a', 'd']
+
+    buf.apply(modifications)
+
+    assert lst == ['a', 'b', 'c', 'd']
+
+
 def test_buf_set_value():
     lst = ['a', 'b', 'c']
 
@@ -133,6 +163,24 @@ def test_buf_multiple_modifications():
     assert lst == ['a', 'b', 'c']
 
 
+def test_buf_set_same_line_repeatedly_records_once():
+    lst = ['a', 'b', 'c']
+
+    buf = Buf(lst)
+
+    with buf.record() as modifications:
+        buf[1] = 'b1'
+        buf[1] = 'b12'
+        buf[1] = 'b123'
+
+    assert lst == ['a', 'b123', 'c']
+    assert len(modifications) == 1
+
+    buf.apply(modifications)
+
+    assert lst == ['a', 'b', 'c']
+
+
 def test_buf_iter():
     buf = Buf(['a', 'b', 'c'])
     buf_iter = iter(buf)
@@ -244,3 +292,28 @@ def test_set_tab_size():
 
     buf.set_tab_size(8)
     assert buf.line_positions(0) == (0, 8, 9)
+
+
+def test_line_positions_printable_ascii():
+    # does not need to consult wcwidth
+    with mock.patch.object(babi.buf, 'wcwidth', side_effect=AssertionError):
+        buf = Buf(['hello world', ''])
+        assert buf.line_positions(0) == tuple(range(12))
+        assert buf.line_positions(1) == (0,)
+
+
+@pytest.mark.usefixtures('fake_wcwidth')
+def test_line_positions_after_append_and_truncate():
+    buf = Buf(['a\t'])
+    assert buf.line_positions(0) == (0, 1, 4)
+
+    buf[0] = 'a\t🔵b'
+    assert buf.line_positions(0) == (0, 1, 4, 6, 7)
+    buf[0] = 'a\t🔵b\tc'
+    assert buf.line_positions(0) == (0, 1, 4, 6, 7, 8, 9)
+
+    buf[0] = 'a\t🔵'
+    assert buf.line_positions(0) == (0, 1, 4, 6)
+
+    buf[0] = 'b\t🔵'
+    assert buf.line_positions(0) == (0, 1, 4, 6)
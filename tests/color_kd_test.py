@@ -63,3 +63,8 @@ def test_smoke_kd_256():
     kd_256 = color_kd.make_256()
     assert color_kd.nearest(Color(0, 0, 0), kd_256) == 16
     assert color_kd.nearest(Color(0x1e, 0x77, 0xd3), kd_256) == 32
+
+
+def test_nearest_256():
+    assert color_kd.nearest_256(Color(0, 0, 0)) == 16
+    assert color_kd.nearest_256(Color(0x1e, 0x77, 0xd3)) == 32
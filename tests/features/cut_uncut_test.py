@@ -19,6 +19,22 @@ def test_cut_and_uncut(run, ten_lines):
         h.await_text('line_0')
 
 
+def test_uncut_undo(run, ten_lines):
+    with run(str(ten_lines)) as h, and_exit(h):
+        h.press('^K')
+        h.press('^K')
+        h.await_text_missing('line_1')
+        h.press('Right')
+        h.press('^U')
+        h.await_text('lline_0\nline_1\nine_2\n')
+        h.await_cursor_position(x=0, y=3)
+
+        h.press('M-u')
+        h.await_text('line_2\nline_3\n')
+        h.await_text_missing('line_1')
+        h.await_cursor_position(x=1, y=1)
+
+
 def test_cut_at_beginning_of_file(run):
     with run() as h, and_exit(h):
         h.press('^K')
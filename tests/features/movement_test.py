@@ -415,6 +415,13 @@ def test_sequence_handling(run_only_fake):
         h.await_text(r'\x1b[1;')
 
 
+def test_sequence_does_not_consume_following_input(run_only_fake):
+    with run_only_fake() as h, and_exit(h):
+        h.press_sequence('\x1b[1~\x1b[4~hello')  # Home + End
+        h.await_text('hello')
+        h.await_text_missing('unknown key')
+
+
 def test_indentation_using_tabs(run, tmpdir):
     f = tmpdir.join('f')
     f.write(f'123456789\n\t12\t{"x" * 20}\n')
@@ -242,6 +242,17 @@ def test_save_on_exit_cancel_yn(run):
         h.await_text('cancelled')
 
 
+def test_save_on_exit_prompt_after_buffered_input(run_only_fake):
+    with run_only_fake() as h, and_exit(h):
+        # the ^X is buffered while reading the string
+        h.press_sequence('h', 'i', '^X')
+        h.await_text('file is modified - save [yes, no]?')
+        h.await_text('hi')
+        h.await_text(' *')
+        h.press('^C')
+        h.await_text('cancelled')
+
+
 def test_save_on_exit_cancel_filename(run):
     with run() as h, and_exit(h):
         h.press('hello')
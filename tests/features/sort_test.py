@@ -23,6 +23,17 @@ def test_sort_entire_file(run, unsorted):
     assert unsorted.read() == 'a\nb\nc\nd\n'
 
 
+def test_sort_already_sorted_file_is_not_modified(run, tmpdir):
+    f = tmpdir.join('f')
+    f.write('a\nb\nc\n')
+
+    with run(str(f)) as h, and_exit(h):
+        trigger_command_mode(h)
+        h.press_and_enter(':sort')
+        h.await_text('sorted!')
+        h.await_text_missing('*')
+
+
 def test_reverse_sort_entire_file(run, unsorted):
     with run(str(unsorted)) as h, and_exit(h):
         trigger_command_mode(h)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from unittest import mock
+
 import pytest
 
+from babi.screen import Screen
 from testing.runner import and_exit
 
 
@@ -162,3 +165,22 @@ def test_press_string_sequence(run):
         h.press('hello world\x1bOH')
         h.await_text('hello world')
         h.await_cursor_position(x=0, y=1)
+
+
+def test_paste_skips_intermediate_draws(run_only_fake):
+    draws = []
+    with mock.patch.object(
+            Screen, 'draw', autospec=True, side_effect=Screen.draw,
+    ) as draw:
+        with run_only_fake() as h, and_exit(h):
+            h.run(lambda: draws.append(draw.call_count))
+            # the enter is buffered while reading `hi` so that edit is
+            # applied without drawing the screen in between
+            h.press_sequence('h', 'i', 'Enter', 't', 'h', 'e', 'r', 'e')
+            h.run(lambda: draws.append(draw.call_count))
+            h.assert_screen_line_equal(1, 'hi')
+            h.assert_screen_line_equal(2, 'there')
+            h.await_cursor_position(x=5, y=2)
+
+    before, after = draws
+    assert after - before == 2
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import io
-
 import pytest
 
 from babi.color_manager import ColorManager
+from babi.file import _get_lines_from_text
+from babi.file import _load_file
 from babi.file import File
-from babi.file import get_lines
 from babi.highlight import Grammars
 from babi.hl.syntax import Syntax
 from babi.theme import Theme
@@ -26,15 +25,27 @@ def test_position_repr():
         pytest.param('1\r\n2\r\n', ['1', '2', ''], '\r\n', False, id='crlf'),
         pytest.param('1\r\n2\n', ['1', '2', ''], '\n', True, id='mixed'),
         pytest.param('1\n2', ['1', '2', ''], '\n', False, id='noeol'),
+        pytest.param('a\rb\n', ['a\rb', ''], '\n', False, id='lone cr'),
+        pytest.param(
+            '1\r2\r\n3\r', ['1\r2', '3\r', ''], '\r\n', False,
+            id='lone cr with crlf',
+        ),
     ),
 )
-def test_get_lines(s, lines, nl, mixed):
+def test_get_lines_from_text(s, lines, nl, mixed):
     # sha256 tested below
-    ret_lines, ret_nl, ret_mixed, _ = get_lines(io.StringIO(s))
+    ret_lines, ret_nl, ret_mixed, _ = _get_lines_from_text(s)
     assert (ret_lines, ret_nl, ret_mixed) == (lines, nl, mixed)
 
 
-def test_get_lines_sha256_checksum():
-    ret = get_lines(io.StringIO(''))
+def test_load_file_lone_cr(tmpdir):
+    f = tmpdir.join('f')
+    f.write_binary(b'a\rb\n')
+    lines, nl, mixed, _ = _load_file(str(f))
+    assert (lines, nl, mixed) == (['a\rb', ''], '\n', False)
+
+
+def test_get_lines_from_text_sha256_checksum():
+    ret = _get_lines_from_text('')
     sha256 = 'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'
     assert ret == ([''], '\n', False, sha256)
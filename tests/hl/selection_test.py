@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import curses
+from unittest import mock
+
+import pytest
+
+from babi.buf import Buf
+from babi.hl.interface import HL
+from babi.hl.selection import Selection
+
+ATTR = curses.A_REVERSE | curses.A_DIM | (1 << 8)
+
+
+@pytest.fixture(autouse=True)
+def fake_color_pair():
+    with mock.patch.object(curses, 'color_pair', lambda n: n << 8):
+        yield
+
+
+@pytest.fixture
+def buf_selection():
+    buf = Buf(['hello', 'world', 'foo', 'bar', ''])
+    selection = Selection()
+    selection.register_callbacks(buf)
+    selection.set(0, 1, 2, 2)
+    selection.highlight_until(buf, len(buf))
+    yield buf, selection
+
+
+def test_highlight_regions(buf_selection):
+    _, selection = buf_selection
+    assert selection.regions == {
+        0: (HL(x=1, end=6, attr=ATTR),),
+        1: (HL(x=0, end=6, attr=ATTR),),
+        2: (HL(x=0, end=2, attr=ATTR),),
+    }
+
+
+def test_highlight_unchanged_is_not_recomputed(buf_selection):
+    buf, selection = buf_selection
+    selection.regions[1] = ()
+    selection.highlight_until(buf, len(buf))
+    assert selection.regions[1] == ()
+
+
+def test_highlight_after_set(buf_selection):
+    buf, selection = buf_selection
+    buf[1] = 'hello world'
+    selection.highlight_until(buf, len(buf))
+    assert selection.regions[1] == (HL(x=0, end=12, attr=ATTR),)
+
+
+def test_highlight_after_delete(buf_selection):
+    buf, selection = buf_selection
+    del buf[1]
+    selection.highlight_until(buf, len(buf))
+    assert selection.regions[1] == (HL(x=0, end=4, attr=ATTR),)
+
+
+def test_highlight_after_insert(buf_selection):
+    buf, selection = buf_selection
+    buf.insert(1, 'hi')
+    selection.highlight_until(buf, len(buf))
+    assert selection.regions[1] == (HL(x=0, end=3, attr=ATTR),)
+
+
+def test_highlight_after_delete_lines(buf_selection):
+    buf, selection = buf_selection
+    buf.delete_lines(1, 3)
+    selection.highlight_until(buf, len(buf))
+    assert selection.regions[1] == (HL(x=0, end=4, attr=ATTR),)
+
+
+def test_highlight_after_insert_lines(buf_selection):
+    buf, selection = buf_selection
+    buf.insert_lines(1, ['a', 'bc'])
+    selection.highlight_until(buf, len(buf))
+    assert selection.regions[1] == (HL(x=0, end=2, attr=ATTR),)
+
+
+def test_highlight_after_replace_lines(buf_selection):
+    buf, selection = buf_selection
+    buf.replace_lines(['hello', 'everyone', 'foo', 'bar', ''])
+    selection.highlight_until(buf, len(buf))
+    assert selection.regions[1] == (HL(x=0, end=9, attr=ATTR),)